@@ -0,0 +1,263 @@
+"""
+Analytics em tempo real dos envios do formulário de contato
+
+Contadores em memória, atualizados a cada envio, em três resoluções:
+últimos 60 minutos, últimas 24 horas e últimos 30 dias. Cada resolução é um
+ring buffer de tamanho fixo; cada slot guarda o total e a quebra por
+resultado, país (header CF-IPCountry) e palavra-chave do assunto.
+
+Registrar um evento é O(1) e a memória é fixa: os slots são reaproveitados
+quando o tempo avança e as dimensões têm cardinalidade limitada (resultados
+conhecidos, códigos ISO de país e um vocabulário fixo de palavras-chave).
+Os totais de cada janela também são mantidos incrementalmente, então
+consultar /api/stats nunca percorre registros brutos.
+
+Cada mensagem conta uma vez, pelo resultado FINAL: requisições que repetem
+uma Idempotency-Key já vista (retentativas do cliente, replays, 409) ficam
+fora do total e das quebras e são contadas à parte, em `retries`, por
+resultado. Quando uma retentativa termina com outro resultado (ex.: timeout
+-> success), a mensagem é reclassificada no slot da primeira tentativa, se
+ele ainda estiver na janela. Para isso cada chave guarda o horário e o
+resultado da primeira tentativa, num mapa limitado em tamanho e idade.
+
+Os horários são em UTC. Como o idempotency.py, o estado é por processo.
+"""
+
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+
+
+# Resolução -> (segundos por slot, quantidade de slots)
+RESOLUTIONS = {
+    'minute': (60, 60),
+    'hour': (3600, 24),
+    'day': (86400, 30),
+}
+
+# Palavras-chave reconhecidas no assunto (sem acento, minúsculas)
+SUBJECT_KEYWORDS = (
+    'orcamento', 'projeto', 'freelance', 'vaga', 'emprego', 'estagio',
+    'parceria', 'proposta', 'site', 'app', 'api', 'duvida', 'suporte',
+)
+OTHER_KEYWORD = 'outro'
+UNKNOWN_COUNTRY = 'XX'
+
+DIMENSIONS = ('outcome', 'country', 'keyword', 'retries')
+
+# Resultados que não encerram uma mensagem: só contam como retentativa
+NON_FINAL_OUTCOMES = ('duplicate', 'in_progress', 'conflict')
+
+# Chaves de idempotência lembradas para reclassificar a mensagem
+MAX_TRACKED_KEYS = 10000
+
+
+def normalize_country(code):
+    """Código ISO de 2 letras do Cloudflare (ou XX se ausente/inválido)"""
+    code = (code or '').strip().upper()
+    return code if re.fullmatch(r'[A-Z][A-Z0-9]', code) else UNKNOWN_COUNTRY
+
+
+def subject_keyword(subject):
+    """Primeira palavra do assunto que pertence ao vocabulário (ou 'outro')"""
+    text = unicodedata.normalize('NFKD', subject or '').encode('ascii', 'ignore').decode()
+    for word in re.findall(r'[a-z]+', text.lower()):
+        if word in SUBJECT_KEYWORDS:
+            return word
+    return OTHER_KEYWORD
+
+
+class _Slot:
+    __slots__ = ('bucket', 'total', 'outcome', 'country', 'keyword', 'retries')
+
+    def __init__(self):
+        self.bucket = None
+        self.total = 0
+        self.outcome = Counter()
+        self.country = Counter()
+        self.keyword = Counter()
+        self.retries = Counter()
+
+    def count(self, outcome, country, keyword, retry):
+        if retry:
+            self.retries[outcome] += 1
+            return
+        self.total += 1
+        self.outcome[outcome] += 1
+        self.country[country] += 1
+        self.keyword[keyword] += 1
+
+    def reclassify(self, old, new):
+        self.outcome[old] -= 1
+        if self.outcome[old] <= 0:
+            del self.outcome[old]
+        self.outcome[new] += 1
+
+    def as_dict(self):
+        return {
+            'total': self.total,
+            'outcome': dict(self.outcome),
+            'country': dict(self.country),
+            'keyword': dict(self.keyword),
+            'retries': dict(self.retries),
+        }
+
+
+class RingCounter:
+    """
+    Ring buffer de slots de tamanho fixo + agregado incremental da janela
+    """
+
+    def __init__(self, width, size):
+        self.width = width
+        self.size = size
+        self.slots = [_Slot() for _ in range(size)]
+        self.window = _Slot()
+        self.last_bucket = None
+
+    def advance(self, now):
+        """
+        Zera os slots que saíram da janela (no máximo `size` slots por chamada)
+        e desconta seus valores do agregado
+        """
+        bucket = int(now // self.width)
+        if self.last_bucket is None:
+            self.last_bucket = bucket
+        elif bucket > self.last_bucket:
+            for stale in range(max(self.last_bucket + 1, bucket - self.size + 1), bucket + 1):
+                self._expire(self.slots[stale % self.size])
+            self.last_bucket = bucket
+        return bucket
+
+    def add(self, now, outcome, country, keyword, retry=False):
+        bucket = self.advance(now)
+        if bucket <= self.last_bucket - self.size:
+            return  # Relógio voltou para antes da janela
+        slot = self.slots[bucket % self.size]
+        if slot.bucket != bucket:
+            self._expire(slot)
+            slot.bucket = bucket
+
+        slot.count(outcome, country, keyword, retry)
+        self.window.count(outcome, country, keyword, retry)
+
+    def reclassify(self, now, timestamp, old, new):
+        """
+        Troca o resultado de uma mensagem contada em `timestamp`, se o slot
+        dela ainda estiver na janela
+        """
+        self.advance(now)
+        bucket = int(timestamp // self.width)
+        slot = self.slots[bucket % self.size]
+        if slot.bucket != bucket:
+            return
+        slot.reclassify(old, new)
+        self.window.reclassify(old, new)
+
+    def _expire(self, slot):
+        if slot.bucket is None:
+            return
+        self.window.total -= slot.total
+        for dimension in DIMENSIONS:
+            window_counter = getattr(self.window, dimension)
+            window_counter.subtract(getattr(slot, dimension))
+            # Remove chaves zeradas para manter a memória limitada
+            for key in [key for key, value in window_counter.items() if value <= 0]:
+                del window_counter[key]
+            getattr(slot, dimension).clear()
+        slot.total = 0
+        slot.bucket = None
+
+    def snapshot(self, now):
+        bucket = self.advance(now)
+        series = []
+        for offset in range(self.size - 1, -1, -1):
+            current = bucket - offset
+            slot = self.slots[current % self.size]
+            series.append({
+                'start': _isoformat(current * self.width),
+                'total': slot.total if slot.bucket == current else 0,
+            })
+
+        peak = max(series, key=lambda point: point['total'])
+        return {
+            'slot_seconds': self.width,
+            **self.window.as_dict(),
+            'peak': peak if peak['total'] else None,
+            'series': series,
+        }
+
+
+class SubmissionAnalytics:
+    """
+    Contadores por minuto/hora/dia + totais desde que o processo subiu
+    """
+
+    def __init__(self, resolutions=RESOLUTIONS, clock=time.time, max_keys=MAX_TRACKED_KEYS):
+        self.clock = clock
+        self.started_at = clock()
+        self.rings = {name: RingCounter(width, size) for name, (width, size) in resolutions.items()}
+        self.totals = _Slot()
+        # Chave -> [horário da primeira tentativa, resultado atual da mensagem]
+        self.messages = OrderedDict()
+        self.max_keys = max_keys
+        self.horizon = max(width * size for width, size in resolutions.values())
+        self._lock = threading.Lock()
+
+    def record(self, outcome, country=None, subject=None, key=None):
+        """
+        Registra um envio do formulário - O(1)
+
+        Args:
+            key (str): Idempotency-Key da requisição. A primeira requisição de
+                cada chave conta como mensagem; as seguintes vão para `retries`
+                e, se trouxerem um resultado final diferente, reclassificam a
+                mensagem. Sem chave, cada requisição é uma mensagem.
+        """
+        country = normalize_country(country)
+        keyword = subject_keyword(subject)
+        now = self.clock()
+
+        with self._lock:
+            self._forget_old_keys(now)
+            message = self.messages.get(key) if key else None
+            retry = message is not None or outcome in NON_FINAL_OUTCOMES
+
+            for ring in self.rings.values():
+                ring.add(now, outcome, country, keyword, retry)
+            self.totals.count(outcome, country, keyword, retry)
+
+            if message is not None:
+                first_seen, previous = message
+                if outcome not in NON_FINAL_OUTCOMES and outcome != previous:
+                    for ring in self.rings.values():
+                        ring.reclassify(now, first_seen, previous, outcome)
+                    self.totals.reclassify(previous, outcome)
+                    message[1] = outcome
+            elif key and not retry:
+                self.messages[key] = [now, outcome]
+
+    def _forget_old_keys(self, now):
+        """Descarta chaves além do limite ou mais antigas que a maior janela"""
+        while self.messages:
+            first_seen = next(iter(self.messages.values()))[0]
+            if len(self.messages) < self.max_keys and now - first_seen < self.horizon:
+                break
+            self.messages.popitem(last=False)
+
+    def snapshot(self):
+        now = self.clock()
+        with self._lock:
+            return {
+                'generated_at': _isoformat(now),
+                'since': _isoformat(self.started_at),
+                'totals': self.totals.as_dict(),
+                **{name: ring.snapshot(now) for name, ring in self.rings.items()},
+            }
+
+
+def _isoformat(timestamp):
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
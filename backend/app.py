@@ -3,15 +3,19 @@ Backend Flask para envio de emails do portfólio
 Configurado com SMTP para Gmail + Cloudflare Turnstile (Captcha)
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g
 from flask_cors import CORS
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
+import hmac
 import os
+import re
 from dotenv import load_dotenv
 import requests  # Para validação do Turnstile
+from idempotency import IdempotencyStore, fingerprint, RETRY, REPLAY, IN_PROGRESS, CONFLICT
+from analytics import SubmissionAnalytics
 
 # Carrega variáveis de ambiente
 load_dotenv()
@@ -25,11 +29,31 @@ SMTP_PORT = os.getenv('SMTP_PORT')
 SMTP_EMAIL = os.getenv('SMTP_EMAIL')
 SMTP_PASSWORD = os.getenv('SMTP_PASSWORD')
 RECIPIENT_EMAIL = os.getenv('RECIPIENT_EMAIL')
+SMTP_TIMEOUT = int(os.getenv('SMTP_TIMEOUT', 15))
 
 # Configuração Cloudflare Turnstile
 CLOUDFLARE_SECRET = os.getenv('CLOUDFLARE_SECRET_KEY')
 TURNSTILE_VERIFY_URL = 'https://challenges.cloudflare.com/turnstile/v0/siteverify'
 
+# Idempotência (evita emails duplicados quando o cliente reenvia)
+IDEMPOTENCY_TTL = int(os.getenv('IDEMPOTENCY_TTL', 86400))
+IDEMPOTENCY_KEY_PATTERN = re.compile(r'^[A-Za-z0-9_-]{8,128}$')
+idempotency_store = IdempotencyStore(ttl=IDEMPOTENCY_TTL)
+
+# Analytics dos envios (GET /api/stats): só responde com "Authorization: Bearer <STATS_TOKEN>"
+# (sem STATS_TOKEN configurado o endpoint fica desativado)
+STATS_TOKEN = os.getenv('STATS_TOKEN')
+submission_analytics = SubmissionAnalytics()
+
+# Resultado de cada envio para o analytics, a partir do status HTTP
+OUTCOME_BY_STATUS = {
+    200: 'success',
+    400: 'invalid',
+    403: 'captcha_failed',
+    409: 'in_progress',
+    422: 'conflict',
+}
+
 
 def get_email_template_to_admin(name, email, subject, message):
 
@@ -495,6 +519,22 @@ def get_confirmation_email_template(name):
     """
 
 
+def get_client_ip():
+    """
+    Pega o IP real do cliente (considerando proxies/cloudflare)
+    """
+    return request.headers.get('CF-Connecting-IP') or \
+           request.headers.get('X-Forwarded-For', '').split(',')[0].strip() or \
+           request.remote_addr
+
+
+def get_client_country():
+    """
+    País do cliente informado pela Cloudflare (código ISO, ex.: BR)
+    """
+    return request.headers.get('CF-IPCountry')
+
+
 def verify_turnstile_token(token, remote_ip=None):
     """
     Valida o token do Cloudflare Turnstile
@@ -540,37 +580,103 @@ def send_email():
     2. Para a pessoa com confirmação automática decorada
     
     PROTEGIDO POR CLOUDFLARE TURNSTILE (Anti-bot)
+    
+    IDEMPOTENTE: com o header Idempotency-Key, retentativas com a mesma chave
+    devolvem a resposta original em vez de enviar os emails de novo
+    """
+    idempotency_key = request.headers.get('Idempotency-Key', '').strip()
+    
+    if not idempotency_key:
+        return process_email()
+    
+    if not IDEMPOTENCY_KEY_PATTERN.match(idempotency_key):
+        return jsonify({
+            'success': False,
+            'message': 'Idempotency-Key inválida'
+        }), 400
+    
+    data = request.get_json(silent=True) or {}
+    state, record = idempotency_store.begin(idempotency_key, fingerprint(data))
+    
+    # O analytics conta uma mensagem por chave, pelo resultado final
+    g.analytics_key = idempotency_key
+    
+    if state == REPLAY:
+        g.analytics_outcome = 'duplicate'
+        return jsonify(record['body']), record['status']
+    
+    if state == IN_PROGRESS:
+        return jsonify({
+            'success': False,
+            'message': 'Mensagem ainda em processamento. Tente novamente em instantes.'
+        }), 409
+    
+    if state == CONFLICT:
+        return jsonify({
+            'success': False,
+            'message': 'Idempotency-Key já utilizada com outro conteúdo'
+        }), 422
+    
+    # Retentativa de um envio que já passou pelo captcha (o token é de uso único)
+    # e/ou que já enviou o email do admin: refaz só o que faltou
+    is_retry = state == RETRY
+    response, status_code = process_email(
+        skip_captcha=is_retry and record['skip_captcha'],
+        admin_sent=is_retry and record['admin_sent']
+    )
+    
+    if status_code < 300:
+        idempotency_store.complete(idempotency_key, response.get_json(), status_code)
+    else:
+        idempotency_store.release(
+            idempotency_key,
+            captcha_verified=g.get('captcha_verified', False),
+            admin_sent=g.get('admin_sent', False)
+        )
+    
+    return response, status_code
+
+
+def process_email(skip_captcha=False, admin_sent=False):
+    """
+    Valida o captcha e os campos do formulário e envia os emails
+    
+    Args:
+        skip_captcha (bool): Pula o Turnstile (já validado para esta Idempotency-Key)
+        admin_sent (bool): Não reenvia o email do admin (já enviado nesta Idempotency-Key)
+    
+    Returns:
+        tuple: (Response, status HTTP)
     """
     try:
         data = request.get_json()
         
         # ===== 1. VALIDAÇÃO DO CAPTCHA (Turnstile) =====
-        token_captcha = data.get('token_captcha')
+        if not skip_captcha:
+            token_captcha = data.get('token_captcha')
         
-        if not token_captcha:
-            return jsonify({
-                'success': False,
-                'message': '🤖 Captcha obrigatório! Por favor, complete a verificação.'
-            }), 400
+            if not token_captcha:
+                return jsonify({
+                    'success': False,
+                    'message': '🤖 Captcha obrigatório! Por favor, complete a verificação.'
+                }), 400
         
-        # Pega o IP real do cliente (considerando proxies/cloudflare)
-        client_ip = request.headers.get('CF-Connecting-IP') or \
-                    request.headers.get('X-Forwarded-For', '').split(',')[0].strip() or \
-                    request.remote_addr
+            client_ip = get_client_ip()
         
-        # Valida o token com Cloudflare
-        verification = verify_turnstile_token(token_captcha, client_ip)
+            # Valida o token com Cloudflare
+            verification = verify_turnstile_token(token_captcha, client_ip)
         
-        if not verification.get('success'):
-            error_codes = verification.get('error-codes', [])
-            print(f"❌ Falha na verificação Turnstile: {error_codes}")
+            if not verification.get('success'):
+                error_codes = verification.get('error-codes', [])
+                print(f"❌ Falha na verificação Turnstile: {error_codes}")
             
-            return jsonify({
-                'success': False,
-                'message': '🚫 Falha na verificação do Captcha. Você é um robô? Tente novamente.'
-            }), 403
+                return jsonify({
+                    'success': False,
+                    'message': '🚫 Falha na verificação do Captcha. Você é um robô? Tente novamente.'
+                }), 403
         
-        print(f"✅ Captcha validado com sucesso! IP: {client_ip}")
+            print(f"✅ Captcha validado com sucesso! IP: {client_ip}")
+            g.captcha_verified = True
         
         # ===== 2. VALIDAÇÃO DOS CAMPOS DO FORMULÁRIO =====
         required_fields = ['name', 'email', 'subject', 'message']
@@ -659,12 +765,14 @@ Enzo Amancio | Desenvolvedor Full Stack
         msg_user.attach(part2_user)
         
         # Enviar AMBOS os emails
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
+        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=SMTP_TIMEOUT) as server:
             server.starttls()
             server.login(SMTP_EMAIL, SMTP_PASSWORD)
             
-            # Enviar email para admin
-            server.send_message(msg_admin)
+            # Enviar email para admin (pulado se uma tentativa anterior já enviou)
+            if not admin_sent:
+                server.send_message(msg_admin)
+                g.admin_sent = True
             
             # Enviar email de confirmação para o remetente
             server.send_message(msg_user)
@@ -688,6 +796,47 @@ Enzo Amancio | Desenvolvedor Full Stack
         }), 500
 
 
+@app.after_request
+def record_submission(response):
+    """
+    Conta cada POST em /api/send-email no analytics (O(1), não bloqueia a resposta)
+    """
+    if request.endpoint == 'send_email' and request.method == 'POST':
+        data = request.get_json(silent=True) or {}
+        outcome = g.get('analytics_outcome') or OUTCOME_BY_STATUS.get(response.status_code, 'error')
+        submission_analytics.record(
+            outcome,
+            get_client_country(),
+            str(data.get('subject', '')),
+            key=g.get('analytics_key')
+        )
+    return response
+
+
+@app.route('/api/stats', methods=['GET'])
+def stats():
+    """
+    Estatísticas agregadas dos envios: por minuto, hora e dia,
+    quebradas por resultado, país e palavra-chave do assunto
+    
+    PROTEGIDO: exige STATS_TOKEN configurado e enviado como Bearer token
+    """
+    if not STATS_TOKEN:
+        return jsonify({
+            'success': False,
+            'message': 'Endpoint desativado'
+        }), 404
+    
+    authorization = request.headers.get('Authorization', '')
+    if not hmac.compare_digest(authorization.encode('utf-8'), f'Bearer {STATS_TOKEN}'.encode('utf-8')):
+        return jsonify({
+            'success': False,
+            'message': 'Não autorizado'
+        }), 401
+
+    return jsonify(submission_analytics.snapshot()), 200
+
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """
@@ -0,0 +1,156 @@
+"""
+Armazenamento de chaves de idempotência para o envio de emails
+
+Cada envio do frontend carrega um header Idempotency-Key. Retentativas com a
+mesma chave não disparam emails duplicados: se o primeiro envio já terminou,
+a resposta original é devolvida; se ainda está em andamento, o cliente recebe
+409 e tenta de novo mais tarde.
+
+Uma chave cujo captcha já passou pode ser reenviada sem novo token do
+Turnstile (os tokens são de uso único), mas só por um número limitado de
+vezes e dentro da validade do token. O registro também guarda se o email do
+admin já saiu, para que a retentativa envie só a etapa que faltou.
+
+O armazenamento é em memória, compartilhado pelas threads de UM processo.
+Por isso o deploy usa um único worker do gunicorn com várias threads
+(veja a seção Produção do README).
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+# Estados retornados por IdempotencyStore.begin()
+NEW = 'new'                  # Chave nunca vista: processar normalmente
+RETRY = 'retry'              # Tentativa anterior falhou: processar de novo
+REPLAY = 'replay'            # Já concluída: devolver a resposta salva
+IN_PROGRESS = 'in_progress'  # Outra requisição com a mesma chave está rodando
+CONFLICT = 'conflict'        # Mesma chave com conteúdo diferente
+
+
+def fingerprint(data, fields=('name', 'email', 'subject', 'message')):
+    """
+    Hash do conteúdo do formulário (sem o token do captcha, que muda a cada tentativa)
+    """
+    content = {field: str(data.get(field, '')).strip() for field in fields}
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class IdempotencyStore:
+    """
+    Mapa chave -> registro com TTL e limite de tamanho, seguro entre threads
+    """
+
+    def __init__(self, ttl=86400, max_entries=10000, captcha_retries=1, captcha_window=300,
+                 clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self.max_entries = max_entries
+        # Retentativas sem captcha permitidas por captcha validado, e por quanto tempo (s)
+        self.captcha_retries = captcha_retries
+        self.captcha_window = captcha_window
+        self._records = OrderedDict()
+        self._lock = threading.Lock()
+
+    def begin(self, key, content_hash):
+        """
+        Registra o início do processamento de uma chave
+
+        Returns:
+            tuple: (estado, registro) - o registro só é relevante em REPLAY e RETRY.
+                Em RETRY, record['skip_captcha'] diz se o captcha pode ser pulado
+                e record['admin_sent'] se o email do admin já foi enviado.
+        """
+        with self._lock:
+            self._evict()
+            record = self._records.get(key)
+
+            if record is None:
+                record = {
+                    'fingerprint': content_hash,
+                    'state': 'processing',
+                    'captcha_verified_at': None,
+                    'captcha_skips': 0,
+                    'skip_captcha': False,
+                    'admin_sent': False,
+                    'body': None,
+                    'status': None,
+                    'expires_at': self.clock() + self.ttl,
+                }
+                self._records[key] = record
+                return NEW, record
+
+            if record['fingerprint'] != content_hash:
+                return CONFLICT, record
+            if record['state'] == 'done':
+                return REPLAY, record
+            if record['state'] == 'processing':
+                return IN_PROGRESS, record
+
+            verified_at = record['captcha_verified_at']
+            record['skip_captcha'] = (
+                verified_at is not None
+                and record['captcha_skips'] < self.captcha_retries
+                and self.clock() - verified_at <= self.captcha_window
+            )
+            if record['skip_captcha']:
+                record['captcha_skips'] += 1
+
+            record['state'] = 'processing'
+            return RETRY, record
+
+    def complete(self, key, body, status):
+        """Salva a resposta de sucesso para ser devolvida nas retentativas"""
+        with self._lock:
+            record = self._records.get(key)
+            if record is not None:
+                record.update(state='done', body=body, status=status)
+
+    def release(self, key, captcha_verified=False, admin_sent=False):
+        """
+        Libera a chave após uma falha para que o cliente possa tentar de novo.
+        Se a chave nunca passou pelo captcha nem enviou email, o registro é
+        removido: chaves aleatórias de requisições sem captcha não ocupam espaço.
+
+        Args:
+            captcha_verified (bool): O Turnstile validou um token NESTA tentativa
+                (renova o limite de retentativas sem captcha)
+            admin_sent (bool): O email do admin foi enviado nesta tentativa
+        """
+        with self._lock:
+            record = self._records.get(key)
+            if record is None:
+                return
+
+            record['state'] = 'failed'
+            record['admin_sent'] = record['admin_sent'] or admin_sent
+            if captcha_verified:
+                record['captcha_verified_at'] = self.clock()
+                record['captcha_skips'] = 0
+
+            if record['captcha_verified_at'] is None and not record['admin_sent']:
+                del self._records[key]
+
+    def _evict(self):
+        """
+        Remove registros expirados e, se o limite foi atingido, os mais antigos.
+        Registros 'processing' nunca são removidos: a requisição ainda está rodando
+        e uma retentativa com a mesma chave precisa receber 409.
+        """
+        now = self.clock()
+        overflow = len(self._records) - self.max_entries + 1
+        stale = []
+
+        for key, record in self._records.items():
+            if record['state'] == 'processing':
+                continue
+            if record['expires_at'] > now and len(stale) >= overflow:
+                break
+            stale.append(key)
+
+        for key in stale:
+            del self._records[key]
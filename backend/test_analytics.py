@@ -0,0 +1,153 @@
+"""
+Testes do analytics dos envios (python -m pytest backend)
+"""
+
+from analytics import SubmissionAnalytics, normalize_country, subject_keyword
+
+
+# Duas resoluções pequenas para cruzar fronteiras de slot e de janela rápido
+RESOLUTIONS = {'minute': (60, 3), 'hour': (3600, 2)}
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_analytics(**kwargs):
+    clock = FakeClock()
+    return SubmissionAnalytics(resolutions=RESOLUTIONS, clock=clock, **kwargs), clock
+
+
+def series(snapshot, name):
+    return [point['total'] for point in snapshot[name]['series']]
+
+
+# ===== Normalização =====
+
+def test_country_and_keyword_are_bounded():
+    assert normalize_country(' br ') == 'BR'
+    assert normalize_country('<script>') == 'XX'
+    assert normalize_country(None) == 'XX'
+    assert subject_keyword('Orçamento de site') == 'orcamento'
+    assert subject_keyword('Olá!') == 'outro'
+
+
+# ===== Janelas =====
+
+def test_series_and_peak_across_slot_boundaries():
+    analytics, clock = make_analytics()
+
+    analytics.record('success', 'BR', 'projeto')
+    clock.now = 59
+    analytics.record('success', 'PT', 'vaga')
+    clock.now = 60
+    analytics.record('error', 'BR')
+    clock.now = 150
+
+    snapshot = analytics.snapshot()
+    minute = snapshot['minute']
+
+    assert series(snapshot, 'minute') == [2, 1, 0]
+    assert minute['total'] == 3
+    assert minute['outcome'] == {'success': 2, 'error': 1}
+    assert minute['country'] == {'BR': 2, 'PT': 1}
+    assert minute['keyword'] == {'projeto': 1, 'vaga': 1, 'outro': 1}
+    assert minute['peak'] == {'start': '1970-01-01T00:00:00Z', 'total': 2}
+    assert series(snapshot, 'hour') == [0, 3]
+
+
+def test_old_slots_leave_the_window():
+    analytics, clock = make_analytics()
+
+    analytics.record('success', 'BR')
+    clock.now = 60
+    analytics.record('error', 'PT')
+
+    clock.now = 180  # O slot do minuto 0 saiu da janela de 3 minutos
+    snapshot = analytics.snapshot()
+    assert series(snapshot, 'minute') == [1, 0, 0]
+    assert snapshot['minute']['total'] == 1
+    assert snapshot['minute']['outcome'] == {'error': 1}
+    assert snapshot['minute']['country'] == {'PT': 1}
+
+    clock.now = 3600 * 5  # Salto maior que todas as janelas
+    snapshot = analytics.snapshot()
+    assert snapshot['minute']['total'] == snapshot['hour']['total'] == 0
+    assert snapshot['minute']['peak'] is None
+    assert snapshot['hour']['outcome'] == {}
+    assert snapshot['totals']['total'] == 2
+
+
+def test_reused_slot_is_reset():
+    analytics, clock = make_analytics()
+
+    analytics.record('success')
+    clock.now = 180  # Mesmo índice do ring (0), bucket diferente
+    analytics.record('error')
+
+    snapshot = analytics.snapshot()
+    assert series(snapshot, 'minute') == [0, 0, 1]
+    assert snapshot['minute']['outcome'] == {'error': 1}
+
+
+# ===== Uma mensagem por Idempotency-Key =====
+
+def test_retries_are_counted_apart():
+    analytics, clock = make_analytics()
+
+    analytics.record('success', 'BR', key='k1')
+    clock.now = 10
+    analytics.record('duplicate', 'BR', key='k1')
+    analytics.record('in_progress', 'BR', key='k2')
+
+    minute = analytics.snapshot()['minute']
+    assert minute['total'] == 1
+    assert minute['outcome'] == {'success': 1}
+    assert minute['retries'] == {'duplicate': 1, 'in_progress': 1}
+
+
+def test_message_is_reclassified_to_final_outcome():
+    analytics, clock = make_analytics()
+
+    analytics.record('error', 'BR', key='k1')
+    clock.now = 70
+    analytics.record('success', 'BR', key='k1')
+
+    snapshot = analytics.snapshot()
+    for window in (snapshot['minute'], snapshot['hour'], snapshot['totals']):
+        assert window['total'] == 1
+        assert window['outcome'] == {'success': 1}
+        assert window['retries'] == {'success': 1}
+    # A mensagem continua no slot da primeira tentativa
+    assert series(snapshot, 'minute') == [0, 1, 0]
+
+
+def test_reclassify_skips_slots_that_left_the_window():
+    analytics, clock = make_analytics()
+
+    analytics.record('error', key='k1')
+    clock.now = 200  # Minuto 0 já saiu da janela; a hora 0 ainda não
+    analytics.record('success', key='k1')
+
+    snapshot = analytics.snapshot()
+    assert snapshot['minute']['total'] == 0
+    assert snapshot['minute']['outcome'] == {}
+    assert snapshot['minute']['retries'] == {'success': 1}
+    assert snapshot['hour']['outcome'] == {'success': 1}
+    assert snapshot['totals']['outcome'] == {'success': 1}
+
+
+def test_tracked_keys_are_bounded():
+    analytics, clock = make_analytics(max_keys=2)
+
+    for key in ('k1', 'k2', 'k3'):
+        analytics.record('error', key=key)
+    assert list(analytics.messages) == ['k2', 'k3']
+
+    clock.now = 7200  # Mais antigas que a maior janela
+    analytics.record('error', key='k4')
+    assert list(analytics.messages) == ['k4']
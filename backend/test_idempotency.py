@@ -0,0 +1,233 @@
+"""
+Testes da idempotência do envio de emails (python -m pytest backend)
+"""
+
+import pytest
+
+from idempotency import (
+    IdempotencyStore, fingerprint,
+    NEW, RETRY, REPLAY, IN_PROGRESS, CONFLICT,
+)
+
+
+FORM = {'name': 'Ana', 'email': 'ana@exemplo.com', 'subject': 'Projeto', 'message': 'Olá'}
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_store(**kwargs):
+    clock = FakeClock()
+    return IdempotencyStore(clock=clock, **kwargs), clock
+
+
+# ===== Store - estados =====
+
+def test_fingerprint_ignores_captcha_token_and_whitespace():
+    assert fingerprint(dict(FORM, token_captcha='a')) == fingerprint(dict(FORM, name=' Ana '))
+    assert fingerprint(FORM) != fingerprint(dict(FORM, message='Outra'))
+
+
+def test_new_in_progress_replay_and_conflict():
+    store, _ = make_store()
+    content = fingerprint(FORM)
+
+    assert store.begin('k1', content)[0] == NEW
+    assert store.begin('k1', content)[0] == IN_PROGRESS
+
+    store.complete('k1', {'success': True}, 200)
+    state, record = store.begin('k1', content)
+    assert state == REPLAY
+    assert (record['body'], record['status']) == ({'success': True}, 200)
+
+    assert store.begin('k1', fingerprint(dict(FORM, message='Outra')))[0] == CONFLICT
+
+
+def test_retry_after_failure_without_captcha_skip():
+    store, _ = make_store()
+    store.begin('k1', 'h')
+    store.release('k1', admin_sent=True)
+
+    state, record = store.begin('k1', 'h')
+    assert state == RETRY
+    assert record['skip_captcha'] is False
+    assert record['admin_sent'] is True
+
+
+# ===== Store - captcha pulado uma única vez =====
+
+def test_captcha_skip_is_one_shot_per_validation():
+    store, _ = make_store()
+    store.begin('k1', 'h')
+    store.release('k1', captcha_verified=True)
+
+    state, record = store.begin('k1', 'h')
+    assert (state, record['skip_captcha']) == (RETRY, True)
+
+    # A tentativa que pulou o captcha não renova a permissão
+    store.release('k1', captcha_verified=False)
+    state, record = store.begin('k1', 'h')
+    assert (state, record['skip_captcha']) == (RETRY, False)
+
+    # Um novo captcha validado renova
+    store.release('k1', captcha_verified=True)
+    assert store.begin('k1', 'h')[1]['skip_captcha'] is True
+
+
+def test_captcha_skip_expires_after_window():
+    store, clock = make_store(captcha_window=300)
+    store.begin('k1', 'h')
+    store.release('k1', captcha_verified=True)
+
+    clock.now += 301
+    state, record = store.begin('k1', 'h')
+    assert (state, record['skip_captcha']) == (RETRY, False)
+
+
+# ===== Store - release() e eviction =====
+
+def test_release_drops_keys_that_never_passed_captcha():
+    store, _ = make_store()
+    store.begin('junk', 'h')
+    store.release('junk')
+
+    assert 'junk' not in store._records
+    assert store.begin('junk', 'h')[0] == NEW
+
+
+def test_release_keeps_keys_with_progress():
+    store, _ = make_store()
+    store.begin('captcha', 'h')
+    store.release('captcha', captcha_verified=True)
+    store.begin('admin', 'h')
+    store.release('admin', admin_sent=True)
+
+    assert set(store._records) == {'captcha', 'admin'}
+
+
+def test_eviction_never_drops_processing_records():
+    store, _ = make_store(max_entries=3)
+    store.begin('running', 'h')
+    store.begin('done-1', 'h')
+    store.complete('done-1', {}, 200)
+    store.begin('done-2', 'h')
+    store.complete('done-2', {}, 200)
+
+    store.begin('new', 'h')
+
+    assert list(store._records) == ['running', 'done-2', 'new']
+    assert store.begin('running', 'h')[0] == IN_PROGRESS
+
+
+def test_expired_records_are_evicted():
+    store, clock = make_store(ttl=60)
+    store.begin('old', 'h')
+    store.complete('old', {}, 200)
+
+    clock.now += 61
+    assert store.begin('old', 'h')[0] == NEW
+
+
+# ===== Endpoint /api/send-email =====
+
+@pytest.fixture
+def backend(monkeypatch):
+    pytest.importorskip('flask')
+    import app as app_module
+
+    calls = {'captcha': 0, 'admin': 0, 'user': 0}
+
+    class FakeSMTP:
+        fail_user = False
+
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            pass
+
+        def starttls(self):
+            pass
+
+        def login(self, *args):
+            pass
+
+        def send_message(self, msg):
+            if msg['To'] == app_module.RECIPIENT_EMAIL:
+                calls['admin'] += 1
+            elif FakeSMTP.fail_user:
+                raise app_module.smtplib.SMTPRecipientsRefused({})
+            else:
+                calls['user'] += 1
+
+    used_tokens = set()
+
+    def fake_verify(token, remote_ip=None):
+        # Tokens do Turnstile são de uso único
+        calls['captcha'] += 1
+        ok = token.startswith('ok') and token not in used_tokens
+        used_tokens.add(token)
+        return {'success': ok}
+
+    monkeypatch.setattr(app_module, 'verify_turnstile_token', fake_verify)
+    monkeypatch.setattr(app_module.smtplib, 'SMTP', FakeSMTP)
+    monkeypatch.setattr(app_module, 'RECIPIENT_EMAIL', 'admin@exemplo.com')
+    monkeypatch.setattr(app_module, 'idempotency_store', IdempotencyStore())
+
+    client = app_module.app.test_client()
+
+    def post(token, key='chave-123456'):
+        return client.post(
+            '/api/send-email',
+            json=dict(FORM, token_captcha=token),
+            headers={'Idempotency-Key': key}
+        )
+
+    return post, calls, FakeSMTP
+
+
+def test_endpoint_replays_completed_key(backend):
+    post, calls, _ = backend
+
+    assert post('ok-1').status_code == 200
+    response = post('ok-1')
+
+    assert response.status_code == 200
+    assert response.get_json()['success'] is True
+    assert calls == {'captcha': 1, 'admin': 1, 'user': 1}
+
+
+def test_endpoint_retry_sends_only_missing_confirmation(backend):
+    post, calls, smtp = backend
+
+    smtp.fail_user = True
+    assert post('ok-1').status_code == 500
+
+    smtp.fail_user = False
+    # Mesmo token (já consumido): o captcha é pulado uma vez
+    assert post('ok-1').status_code == 200
+    assert calls == {'captcha': 1, 'admin': 1, 'user': 1}
+
+
+def test_endpoint_limits_captcha_free_retries(backend):
+    post, calls, smtp = backend
+    smtp.fail_user = True
+
+    assert post('ok-1').status_code == 500
+    assert post('ok-1').status_code == 500
+    # Segunda retentativa precisa de captcha; o token já foi usado
+    assert post('ok-1').status_code == 403
+    assert calls['admin'] == 1
+
+
+def test_endpoint_rejects_invalid_key(backend):
+    post, _, _ = backend
+    assert post('ok-1', key='curta').status_code == 400
@@ -22,6 +22,24 @@ const API_CONFIG = {
     // Timeout para requests (ms)
     timeout: 10000,
     
+    // Retentativas com backoff exponencial + jitter
+    retry: {
+        attempts: 3,         // Total de tentativas por envio
+        baseDelay: 1000,     // Atraso base (ms), dobra a cada tentativa
+        maxDelay: 8000,      // Teto do atraso (ms)
+        pollInterval: 2000,  // Intervalo entre consultas enquanto o servidor responde 409 (ms)
+        pollTimeout: 60000   // Tempo máximo consultando um envio em andamento (ms)
+    },
+    
+    // Chave do sessionStorage com a Idempotency-Key da mensagem ainda não confirmada
+    pendingKey: 'portfolio-pending',
+    
+    // Chave do localStorage com as mensagens pendentes (offline)
+    outboxKey: 'portfolio-outbox',
+    
+    // Mensagens na outbox expiram depois de 7 dias (ms)
+    outboxMaxAge: 7 * 24 * 60 * 60 * 1000,
+    
     // Headers padrão
     headers: {
         'Content-Type': 'application/json'
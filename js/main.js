@@ -104,8 +104,7 @@ document.addEventListener('DOMContentLoaded', function() {
         formMessage.classList.remove('show', 'success', 'error');
 
         // ===== CLOUDFLARE TURNSTILE - Captcha =====
-        const turnstileResponse = document.querySelector('[name="cf-turnstile-response"]');
-        const tokenCaptcha = turnstileResponse ? turnstileResponse.value : null;
+        const tokenCaptcha = getTurnstileToken();
 
         if (!tokenCaptcha) {
             showMessage('🤖 Por favor, complete a verificação de segurança (captcha).', 'error');
@@ -122,12 +121,16 @@ document.addEventListener('DOMContentLoaded', function() {
             token_captcha: tokenCaptcha
         };
 
+        // Mesma chave em todas as tentativas (e nos reenvios do mesmo conteúdo):
+        // o servidor não envia o email duas vezes
+        const idempotencyKey = getIdempotencyKey(formData);
+
         try {
-            const response = await fetch(API_URL, {
-                method: 'POST',
-                headers: API_CONFIG.headers,
-                body: JSON.stringify(formData)
-            });
+            if (!navigator.onLine) {
+                throw new TypeError('Navegador offline');
+            }
+
+            const response = await submitWithRetry(formData, idempotencyKey);
 
             const data = await response.json();
 
@@ -135,9 +138,14 @@ document.addEventListener('DOMContentLoaded', function() {
                 // Sucesso
                 showMessage('✅ ' + data.message, 'success');
                 contactForm.reset();
+                clearPendingKey();
                 
                 // Reset do widget Turnstile
                 resetTurnstile();
+            } else if (response.status === 409) {
+                // Ainda em processamento no servidor: mantém o formulário e a chave
+                showMessage('⏳ Sua mensagem ainda está sendo processada. Se enviar de novo, ela não será duplicada.', 'error');
+                resetTurnstile();
             } else {
                 // Erro
                 showMessage('❌ ' + (data.message || 'Erro ao enviar mensagem. Tente novamente.'), 'error');
@@ -145,7 +153,21 @@ document.addEventListener('DOMContentLoaded', function() {
             }
         } catch (error) {
             console.error('❌ Erro ao enviar formulário:', error);
-            showMessage('❌ Erro de conexão com o servidor. Tente novamente mais tarde.', 'error');
+
+            if (isTimeout(error)) {
+                // O servidor pode já ter enviado: mantém o formulário e a chave
+                showMessage('⏳ O servidor está demorando para responder. Sua mensagem pode já ter sido recebida; se enviar de novo, ela não será duplicada.', 'error');
+            } else if (isNetworkError(error)) {
+                // Sem conexão: guarda na outbox e reenvia quando a rede voltar
+                addToOutbox(formData, idempotencyKey);
+                clearPendingKey();
+                showMessage(navigator.onLine
+                    ? '📥 Não foi possível conectar ao servidor. Sua mensagem foi salva e será enviada automaticamente.'
+                    : '📥 Você está offline. Sua mensagem foi salva e será enviada quando a conexão voltar.', 'success');
+                contactForm.reset();
+            } else {
+                showMessage('❌ Erro de conexão com o servidor. Tente novamente mais tarde.', 'error');
+            }
             resetTurnstile();
         } finally {
             resetButton();
@@ -180,6 +202,226 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
 
+    function getTurnstileToken() {
+        const turnstileResponse = document.querySelector('[name="cf-turnstile-response"]');
+        return turnstileResponse ? turnstileResponse.value : null;
+    }
+
+    // ========================================
+    // ENVIO RESILIENTE - Timeout, Retry e Outbox
+    // ========================================
+
+    // Status em que vale a pena tentar de novo (mesma Idempotency-Key)
+    const RETRYABLE_STATUS = [408, 409, 425, 429, 500, 502, 503, 504];
+
+    function generateIdempotencyKey() {
+        if (window.crypto && crypto.randomUUID) {
+            return crypto.randomUUID();
+        }
+        return Date.now().toString(36) + '-' + Math.random().toString(36).slice(2, 12);
+    }
+
+    function sleep(ms) {
+        return new Promise(resolve => setTimeout(resolve, ms));
+    }
+
+    // Backoff exponencial com "full jitter": espalha as retentativas dos clientes
+    function backoffDelay(attempt) {
+        const { baseDelay, maxDelay } = API_CONFIG.retry;
+        return Math.random() * Math.min(maxDelay, baseDelay * 2 ** attempt);
+    }
+
+    // Falha de rede ou timeout: vale tentar de novo com a mesma chave
+    function isNetworkError(error) {
+        return error instanceof TypeError || isTimeout(error);
+    }
+
+    // Timeout: diferente de uma falha de rede, o servidor pode já ter processado o envio
+    function isTimeout(error) {
+        return Boolean(error) && error.name === 'AbortError';
+    }
+
+    async function fetchWithTimeout(url, options) {
+        const controller = new AbortController();
+        const timer = setTimeout(() => controller.abort(), API_CONFIG.timeout);
+
+        try {
+            return await fetch(url, { ...options, signal: controller.signal });
+        } finally {
+            clearTimeout(timer);
+        }
+    }
+
+    async function submitWithRetry(formData, idempotencyKey) {
+        const { attempts, pollInterval, pollTimeout } = API_CONFIG.retry;
+        const pollUntil = Date.now() + pollTimeout;
+        let attempt = 0;
+
+        while (true) {
+            try {
+                const response = await fetchWithTimeout(API_URL, {
+                    method: 'POST',
+                    headers: { ...API_CONFIG.headers, 'Idempotency-Key': idempotencyKey },
+                    body: JSON.stringify(formData)
+                });
+
+                // 409: o servidor ainda processa esta chave; consulta de novo sem gastar tentativa
+                if (response.status === 409 && Date.now() < pollUntil) {
+                    await sleep(pollInterval);
+                    continue;
+                }
+
+                if (!RETRYABLE_STATUS.includes(response.status) || attempt >= attempts - 1) {
+                    return response;
+                }
+            } catch (error) {
+                if (!isNetworkError(error) || attempt >= attempts - 1) throw error;
+            }
+
+            await sleep(backoffDelay(attempt));
+            attempt++;
+        }
+    }
+
+    // ===== ARMAZENAMENTO LOCAL =====
+
+    function readStorage(storage, key, fallback) {
+        try {
+            return JSON.parse(storage.getItem(key)) || fallback;
+        } catch (e) {
+            return fallback;
+        }
+    }
+
+    function writeStorage(storage, key, value) {
+        try {
+            storage.setItem(key, JSON.stringify(value));
+        } catch (e) {
+            console.warn('⚠️ Não foi possível salvar no armazenamento local:', e);
+        }
+    }
+
+    // ===== CHAVE PENDENTE (sessionStorage) =====
+    // A chave fica guardada com o conteúdo da mensagem até o servidor aceitá-la.
+    // Reenviar o mesmo conteúdo (ex.: depois de um timeout) reaproveita a chave.
+
+    function getIdempotencyKey(formData) {
+        const { token_captcha, ...content } = formData;
+        const serialized = JSON.stringify(content);
+        const pending = readStorage(sessionStorage, API_CONFIG.pendingKey, null);
+
+        if (pending && pending.content === serialized) {
+            return pending.key;
+        }
+
+        const key = generateIdempotencyKey();
+        writeStorage(sessionStorage, API_CONFIG.pendingKey, { key: key, content: serialized });
+        return key;
+    }
+
+    function clearPendingKey() {
+        try {
+            sessionStorage.removeItem(API_CONFIG.pendingKey);
+        } catch (e) {
+            // Armazenamento indisponível: nada a limpar
+        }
+    }
+
+    // ===== OUTBOX (localStorage) =====
+    // O token do captcha não é salvo: ele expira e é de uso único.
+    // Cada envio pendente usa um token novo do widget.
+    // Entradas mais antigas que API_CONFIG.outboxMaxAge são descartadas.
+
+    function readOutbox() {
+        const entries = readStorage(localStorage, API_CONFIG.outboxKey, []);
+        const fresh = entries.filter(entry => Date.now() - entry.createdAt < API_CONFIG.outboxMaxAge);
+
+        if (fresh.length !== entries.length) {
+            writeOutbox(fresh);
+        }
+        return fresh;
+    }
+
+    function writeOutbox(entries) {
+        if (entries.length) {
+            writeStorage(localStorage, API_CONFIG.outboxKey, entries);
+        } else {
+            try {
+                localStorage.removeItem(API_CONFIG.outboxKey);
+            } catch (e) {
+                // Armazenamento indisponível: nada a limpar
+            }
+        }
+    }
+
+    function addToOutbox(formData, idempotencyKey) {
+        const { token_captcha, ...payload } = formData;
+        const entries = readOutbox().filter(entry => entry.key !== idempotencyKey);
+        entries.push({ key: idempotencyKey, payload: payload, createdAt: Date.now() });
+        writeOutbox(entries);
+    }
+
+    function removeFromOutbox(idempotencyKey) {
+        writeOutbox(readOutbox().filter(entry => entry.key !== idempotencyKey));
+    }
+
+    let flushing = false;
+    let flushPaused = false;     // Após falha de rede/servidor, espera o próximo evento 'online'
+    let captchaRejections = 0;   // 403 seguidos: o token do widget pode ter expirado offline
+    const MAX_CAPTCHA_REJECTIONS = 3;
+
+    // Envia UMA mensagem pendente por token do captcha; o reset do widget gera
+    // um novo token e o callback onTurnstileSuccess continua o esvaziamento
+    async function flushOutbox() {
+        const entries = readOutbox();
+        const tokenCaptcha = getTurnstileToken();
+
+        if (flushing || flushPaused || !entries.length || !navigator.onLine || !tokenCaptcha) return;
+
+        flushing = true;
+        const entry = entries[0];
+
+        try {
+            const response = await submitWithRetry(
+                { ...entry.payload, token_captcha: tokenCaptcha },
+                entry.key
+            );
+
+            if (response.ok) {
+                captchaRejections = 0;
+                removeFromOutbox(entry.key);
+                showMessage('✅ Sua mensagem pendente foi enviada com sucesso!', 'success');
+                setTimeout(() => {
+                    formMessage.classList.remove('show');
+                }, 5000);
+            } else if (response.status === 403) {
+                // Token recusado: o reset abaixo gera um novo e o onTurnstileSuccess
+                // tenta de novo; só pausa se o captcha continuar sendo recusado
+                captchaRejections++;
+                flushPaused = captchaRejections >= MAX_CAPTCHA_REJECTIONS;
+            } else if (!RETRYABLE_STATUS.includes(response.status)) {
+                // Rejeição definitiva (ex.: campo inválido): não adianta reenviar
+                removeFromOutbox(entry.key);
+            } else {
+                flushPaused = true;
+            }
+        } catch (error) {
+            console.warn('⚠️ Mensagem pendente continua na outbox:', error);
+            flushPaused = true;
+        } finally {
+            flushing = false;
+            resetTurnstile();
+        }
+    }
+
+    window.onTurnstileSuccess = flushOutbox;
+    window.addEventListener('online', () => {
+        flushPaused = false;
+        captchaRejections = 0;
+        flushOutbox();
+    });
+    flushOutbox();
+
     // ========================================
     // INTERSECTION OBSERVER - Animações
     // ========================================
@@ -0,0 +1,654 @@
+"""
+Build de CSS crítico para o index.html do portfólio
+
+Descobre quais seletores do index.css são usados pelas seções visíveis sem
+rolagem (navbar + hero), injeta esse subconjunto em um <style> no <head> e
+carrega o restante de forma assíncrona (rel="preload" + onload), com fallback
+em <noscript>. O bundle adiado também é podado: regras cujos seletores não
+casam com nenhum elemento do HTML são removidas, assim como @keyframes que
+nenhuma regra usa.
+
+Classes adicionadas em tempo de execução pelo JavaScript (ex.: "scrolled",
+"animated", "cursor") são lidas de js/*.js e tratadas como sempre presentes,
+para que suas regras não sejam descartadas.
+
+O bundle adiado contém TODAS as regras usadas (inclusive as críticas) na
+ordem original, então quando ele carrega a cascata fica idêntica à do
+index.css original.
+
+Uso:
+    python tools/critical_css.py
+    python tools/critical_css.py --fold ".navbar, .hero" --out dist
+
+Saída (em --out): index.html reescrito, index.css podado e os assets locais
+referenciados pelo HTML (js/, photo.JPG), prontos para deploy.
+"""
+
+import argparse
+import os
+import re
+import shutil
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seções renderizadas na primeira dobra da página
+DEFAULT_FOLD = '.navbar, .hero'
+
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr',
+}
+
+
+# ========================================
+# HTML - Árvore de elementos
+# ========================================
+
+@dataclass(eq=False)
+class Node:
+    tag: str
+    attrs: dict = field(default_factory=dict)
+    parent: 'Node' = None
+    children: list = field(default_factory=list)
+    # Nó fictício que representa um filho criado pelo JavaScript
+    virtual: bool = False
+
+    @property
+    def classes(self):
+        return set(self.attrs.get('class', '').split())
+
+    def ancestors(self):
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def descendants(self):
+        for child in self.children:
+            yield child
+            yield from child.descendants()
+
+    def previous_siblings(self):
+        if self.parent is None:
+            return []
+        siblings = self.parent.children
+        return list(reversed(siblings[:siblings.index(self)]))
+
+
+class DomBuilder(HTMLParser):
+    """
+    Monta uma árvore simples de Node a partir do HTML
+    e coleta os assets locais referenciados (src/href)
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node('#document')
+        self.current = self.root
+        self.assets = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {name: value or '' for name, value in attrs}
+        node = Node(tag, attrs, parent=self.current)
+        self.current.children.append(node)
+
+        for name in ('src', 'href'):
+            if is_local_asset(attrs.get(name, '')):
+                self.assets.append(attrs[name])
+
+        if tag not in VOID_ELEMENTS:
+            self.current = node
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.current = self.current.parent
+
+    def handle_endtag(self, tag):
+        # Sobe até o elemento correspondente (tolera HTML mal fechado)
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+
+def is_local_asset(url):
+    if not url or url.startswith(('#', 'mailto:', 'tel:', 'data:', 'javascript:')):
+        return False
+    return not re.match(r'^([a-z]+:)?//', url, re.IGNORECASE)
+
+
+def parse_html(html):
+    builder = DomBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root, builder.assets
+
+
+def collect_dynamic_classes(js_dir):
+    """
+    Lê as classes manipuladas pelo JavaScript:
+    classList.add/remove/toggle/contains('x', ...) e class="x" em strings de HTML
+    """
+    classes = set()
+    if not os.path.isdir(js_dir):
+        return classes
+
+    for filename in sorted(os.listdir(js_dir)):
+        if not filename.endswith('.js'):
+            continue
+        with open(os.path.join(js_dir, filename), encoding='utf-8') as f:
+            source = f.read()
+
+        for args in re.findall(r'classList\.(?:add|remove|toggle|contains)\(([^)]*)\)', source):
+            classes.update(re.findall(r"['\"]([-\w]+)['\"]", args))
+        for value in re.findall(r'class=["\']([^"\']+)["\']', source):
+            classes.update(value.split())
+
+    return classes
+
+
+# ========================================
+# CSS - Parser de regras
+# ========================================
+
+@dataclass
+class StyleRule:
+    selectors: list
+    body: str
+
+
+@dataclass
+class MediaBlock:
+    prelude: str
+    rules: list
+
+
+@dataclass
+class Keyframes:
+    name: str
+    prelude: str
+    rules: list
+
+
+@dataclass
+class AtRule:
+    prelude: str
+    body: str
+
+
+@dataclass
+class StatementAtRule:
+    # At-rules sem bloco, terminados em ";" (@import, @charset, @namespace)
+    text: str
+
+
+STATEMENT_AT_RULE = re.compile(r'\s*(@[-\w]+(?:[^;{"\']|"[^"]*"|\'[^\']*\')*);')
+
+
+def strip_comments(css):
+    return re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+
+
+def find_block_end(css, start):
+    """
+    Retorna o índice da chave que fecha o bloco aberto em css[start]
+    (ignora chaves dentro de strings)
+    """
+    depth = 0
+    quote = None
+    for i in range(start, len(css)):
+        char = css[i]
+        if quote:
+            if char == quote and css[i - 1] != '\\':
+                quote = None
+        elif char in ('"', "'"):
+            quote = char
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return i
+    raise ValueError('CSS inválido: bloco sem chave de fechamento')
+
+
+def split_top_level(text, separator=','):
+    """Divide por vírgula respeitando parênteses e colchetes"""
+    parts, depth, current = [], 0, ''
+    for char in text:
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        if char == separator and depth == 0:
+            parts.append(current.strip())
+            current = ''
+        else:
+            current += char
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+def parse_css(css):
+    """
+    Converte o CSS em uma lista de StyleRule, MediaBlock, Keyframes, AtRule
+    e StatementAtRule, preservando a ordem original
+    """
+    css = strip_comments(css)
+    items = []
+    pos = 0
+
+    while True:
+        statement = STATEMENT_AT_RULE.match(css, pos)
+        if statement:
+            items.append(StatementAtRule(statement.group(1).strip()))
+            pos = statement.end()
+            continue
+
+        brace = css.find('{', pos)
+        if brace == -1:
+            break
+
+        prelude = css[pos:brace].strip()
+        end = find_block_end(css, brace)
+        body = css[brace + 1:end]
+        pos = end + 1
+
+        if prelude.startswith('@media'):
+            items.append(MediaBlock(prelude, parse_css(body)))
+        elif re.match(r'@(-\w+-)?keyframes', prelude):
+            name = prelude.split(None, 1)[1].strip()
+            items.append(Keyframes(name, prelude, parse_css(body)))
+        elif prelude.startswith('@'):
+            # Outros at-rules (@font-face, @supports...) são mantidos como estão
+            items.append(AtRule(prelude, body))
+        else:
+            items.append(StyleRule(split_top_level(prelude), body))
+
+    return items
+
+
+# ========================================
+# Seletores - Matching contra a árvore
+# ========================================
+
+COMPOUND_TOKEN = re.compile(
+    r'(?P<pseudo>::?[-\w]+(?:\((?:[^()]|\([^()]*\))*\))?)'
+    r'|(?P<attr>\[[^\]]*\])'
+    r'|(?P<id>#[-\w]+)'
+    r'|(?P<cls>\.[-\w]+)'
+    r'|(?P<tag>\*|[-\w]+)'
+)
+
+
+def parse_selector(selector):
+    """
+    Divide um seletor em [(combinador, compound), ...] da esquerda para a direita.
+    O compound é um dict com tag, id, classes, attrs e pseudos.
+    """
+    # Normaliza combinadores para facilitar a divisão
+    selector = re.sub(r'\s*([>+~])\s*', r' \1 ', selector.strip())
+    parts = []
+    combinator = ' '
+
+    for token in split_top_level(selector, ' '):
+        if not token:
+            continue
+        if token in ('>', '+', '~'):
+            combinator = token
+            continue
+
+        compound = {'tag': None, 'id': None, 'classes': [], 'attrs': [], 'pseudos': []}
+        for match in COMPOUND_TOKEN.finditer(token):
+            kind, value = match.lastgroup, match.group()
+            if kind == 'tag':
+                compound['tag'] = value.lower()
+            elif kind == 'id':
+                compound['id'] = value[1:]
+            elif kind == 'cls':
+                compound['classes'].append(value[1:])
+            elif kind == 'attr':
+                compound['attrs'].append(value[1:-1])
+            else:
+                compound['pseudos'].append(value)
+
+        parts.append((combinator, compound))
+        combinator = ' '
+
+    return parts
+
+
+def match_attr(expression, node):
+    match = re.match(r'\s*([-\w]+)\s*(?:([~|^$*]?=)\s*["\']?(.*?)["\']?\s*)?$', expression)
+    if not match:
+        return True
+    name, operator, value = match.groups()
+    if name not in node.attrs:
+        return False
+    actual = node.attrs[name]
+    if operator is None:
+        return True
+    if operator == '=':
+        return actual == value
+    if operator == '~=':
+        return value in actual.split()
+    if operator == '^=':
+        return actual.startswith(value)
+    if operator == '$=':
+        return actual.endswith(value)
+    if operator == '*=':
+        return value in actual
+    return actual == value or actual.startswith(value + '-')
+
+
+def match_compound(compound, node, dynamic):
+    """
+    Pseudo-classes de estado (:hover, :focus, :not...) e pseudo-elementos
+    são considerados satisfeitos: o objetivo é saber se a regra PODE aplicar.
+    Classes em `dynamic` são adicionadas pelo JS, então também são satisfeitas.
+    """
+    required = [cls for cls in compound['classes'] if cls not in dynamic]
+
+    if node.virtual:
+        # Filho criado pelo JS: só casa com compounds puramente dinâmicos
+        return (
+            bool(compound['classes']) and not required
+            and compound['id'] is None and not compound['attrs']
+        )
+
+    if ':root' in compound['pseudos'] and node.tag != 'html':
+        return False
+    if compound['tag'] not in (None, '*') and compound['tag'] != node.tag:
+        return False
+    if compound['id'] is not None and node.attrs.get('id') != compound['id']:
+        return False
+    if not set(required) <= node.classes:
+        return False
+    return all(match_attr(attr, node) for attr in compound['attrs'])
+
+
+def match_selector(parts, node, dynamic):
+    """Matching da direita para a esquerda, como nos navegadores"""
+    if not parts:
+        return True
+
+    combinator, compound = parts[-1]
+    if not match_compound(compound, node, dynamic):
+        return False
+
+    rest = parts[:-1]
+    if not rest:
+        return True
+
+    if combinator == '>':
+        candidates = [node.parent] if node.parent is not None else []
+    elif combinator == ' ':
+        candidates = node.ancestors()
+    elif combinator == '+':
+        candidates = node.previous_siblings()[:1]
+    else:
+        candidates = node.previous_siblings()
+
+    return any(
+        candidate.tag != '#document' and match_selector(rest, candidate, dynamic)
+        for candidate in candidates
+    )
+
+
+def select(root, selector_list, dynamic=frozenset()):
+    selectors = [parse_selector(selector) for selector in split_top_level(selector_list)]
+    return [
+        node for node in root.descendants()
+        if any(match_selector(parts, node, dynamic) for parts in selectors)
+    ]
+
+
+# ========================================
+# Extração crítica + poda
+# ========================================
+
+def add_virtual_children(root):
+    """
+    Adiciona a cada elemento um filho fictício que representa conteúdo
+    injetado pelo JS (ex.: <span class="cursor"> dentro do #typing-text)
+    """
+    for node in list(root.descendants()):
+        node.children.append(Node('#virtual', parent=node, virtual=True))
+
+
+def critical_nodes(root, fold_selector):
+    """Elementos da dobra + descendentes + ancestrais (html, body)"""
+    nodes = set()
+    for fold_root in select(root, fold_selector):
+        nodes.add(fold_root)
+        nodes.update(fold_root.descendants())
+        nodes.update(fold_root.ancestors())
+    return nodes
+
+
+def classify_selectors(selectors, root, critical, dynamic):
+    """Retorna (seletores usados, seletores críticos) de uma regra"""
+    used, crit = [], []
+    for selector in selectors:
+        parts = parse_selector(selector)
+        matches = [node for node in root.descendants() if match_selector(parts, node, dynamic)]
+        if matches:
+            used.append(selector)
+            if any(node in critical for node in matches):
+                crit.append(selector)
+    return used, crit
+
+
+def animation_names(body):
+    names = set()
+    for value in re.findall(r'animation(?:-name)?\s*:\s*([^;]+)', body):
+        names.update(re.findall(r'[-\w]+', value))
+    return names
+
+
+def compact(body):
+    """
+    Minifica um bloco de declarações (prop: valor; ...), sem tocar em strings
+    """
+    parts = re.split(r'("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')', body)
+    for i in range(0, len(parts), 2):
+        parts[i] = re.sub(r'\s+', ' ', parts[i])
+        parts[i] = re.sub(r'\s*([;:,])\s*', r'\1', parts[i])
+    return ''.join(parts).strip().rstrip(';')
+
+
+def render(items):
+    out = []
+    for item in items:
+        if isinstance(item, MediaBlock):
+            out.append(f'{item.prelude}{{{render(item.rules)}}}')
+        elif isinstance(item, Keyframes):
+            out.append(f'{item.prelude}{{{render(item.rules)}}}')
+        elif isinstance(item, AtRule):
+            # Corpo mantido como está: pode conter regras aninhadas
+            out.append(f'{item.prelude}{{{item.body}}}')
+        elif isinstance(item, StatementAtRule):
+            out.append(f'{item.text};')
+        else:
+            out.append(f"{','.join(item.selectors)}{{{compact(item.body)}}}")
+    return ''.join(out)
+
+
+def split_stylesheet(items, root, critical, dynamic, stats):
+    """
+    Gera duas listas de itens: críticos e usados (bundle adiado).
+    Mantém @media envolvendo as regras e só inclui @keyframes referenciados.
+    """
+    critical_items, used_items = [], []
+
+    for item in items:
+        if isinstance(item, MediaBlock):
+            crit_rules, used_rules = split_stylesheet(item.rules, root, critical, dynamic, stats)
+            if crit_rules:
+                critical_items.append(MediaBlock(item.prelude, crit_rules))
+            if used_rules:
+                used_items.append(MediaBlock(item.prelude, used_rules))
+        elif isinstance(item, Keyframes):
+            # Decididos depois, quando já sabemos quais animações são usadas
+            critical_items.append(item)
+            used_items.append(item)
+        elif isinstance(item, AtRule):
+            used_items.append(item)
+        elif isinstance(item, StatementAtRule):
+            critical_items.append(item)
+            used_items.append(item)
+        else:
+            used, crit = classify_selectors(item.selectors, root, critical, dynamic)
+            stats['total'] += len(item.selectors)
+            stats['used'] += len(used)
+            stats['critical'] += len(crit)
+            if crit:
+                critical_items.append(StyleRule(crit, item.body))
+            if used:
+                used_items.append(StyleRule(used, item.body))
+
+    return critical_items, used_items
+
+
+def prune_keyframes(items):
+    """Remove @keyframes que nenhuma regra da lista referencia"""
+    def referenced(items):
+        names = set()
+        for item in items:
+            if isinstance(item, MediaBlock):
+                names |= referenced(item.rules)
+            elif isinstance(item, StyleRule):
+                names |= animation_names(item.body)
+        return names
+
+    def prune(items, names):
+        result = []
+        for item in items:
+            if isinstance(item, Keyframes) and item.name not in names:
+                continue
+            if isinstance(item, MediaBlock):
+                item = MediaBlock(item.prelude, prune(item.rules, names))
+                if not item.rules:
+                    continue
+            result.append(item)
+        return result
+
+    return prune(items, referenced(items))
+
+
+def build(html, css, fold_selector=DEFAULT_FOLD, dynamic=frozenset()):
+    """
+    Retorna (css_critico, css_adiado, estatísticas) a partir do HTML e CSS fonte
+    """
+    root, _ = parse_html(html)
+    critical = critical_nodes(root, fold_selector)
+    add_virtual_children(root)
+    # Filhos fictícios de elementos da dobra também são críticos
+    critical |= {child for node in critical for child in node.children if child.virtual}
+
+    stats = {'total': 0, 'used': 0, 'critical': 0}
+    critical_items, used_items = split_stylesheet(parse_css(css), root, critical, dynamic, stats)
+
+    return (
+        render(hoist_statements(prune_keyframes(critical_items))),
+        render(hoist_statements(prune_keyframes(used_items))),
+        stats,
+    )
+
+
+def hoist_statements(items):
+    """
+    @import/@charset só valem no início da folha de estilos: move-os para o topo
+    """
+    statements = [item for item in items if isinstance(item, StatementAtRule)]
+    return statements + [item for item in items if not isinstance(item, StatementAtRule)]
+
+
+def inject(html, css_href, critical_css, deferred_href):
+    """
+    Troca o <link rel="stylesheet"> bloqueante por CSS inline + carregamento assíncrono
+    """
+    pattern = re.compile(
+        r'<link\b(?=[^>]*\brel=["\']stylesheet["\'])(?=[^>]*\bhref=["\']'
+        + re.escape(css_href) + r'["\'])[^>]*>'
+    )
+    if not pattern.search(html):
+        raise ValueError(f'<link rel="stylesheet" href="{css_href}"> não encontrado no HTML')
+
+    replacement = (
+        f'<style>{critical_css}</style>\n'
+        f'    <link rel="preload" href="{deferred_href}" as="style" '
+        f'onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+        f'    <noscript><link rel="stylesheet" href="{deferred_href}"></noscript>'
+    )
+    return pattern.sub(lambda _: replacement, html, count=1)
+
+
+def format_report(css_size, critical_css, deferred_css, stats):
+    """
+    css_size é o tamanho em disco do CSS original (em bytes, com os CRLF)
+    """
+    def size(text):
+        return len(text.encode('utf-8'))
+
+    rows = [
+        ('CSS bloqueante', f'{css_size:,} B', f'{size(critical_css):,} B (inline)'),
+        ('CSS adiado', '0 B', f'{size(deferred_css):,} B'),
+        ('Seletores bloqueantes', str(stats['total']), str(stats['critical'])),
+        ('Seletores no bundle', str(stats['total']), str(stats['used'])),
+        ('Seletores removidos', '-', str(stats['total'] - stats['used'])),
+    ]
+    width = max(len(row[0]) for row in rows)
+    lines = [f"{'':<{width}}  {'Antes':>12}  {'Depois':>22}"]
+    lines += [f'{label:<{width}}  {before:>12}  {after:>22}' for label, before, after in rows]
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extrai o CSS crítico do index.html')
+    parser.add_argument('--html', default=os.path.join(ROOT_DIR, 'index.html'))
+    parser.add_argument('--css', default='index.css', help='href do stylesheet no HTML')
+    parser.add_argument('--js-dir', default=os.path.join(ROOT_DIR, 'js'))
+    parser.add_argument('--fold', default=DEFAULT_FOLD, help='Seletores da primeira dobra')
+    parser.add_argument('--out', default=os.path.join(ROOT_DIR, 'dist'))
+    args = parser.parse_args()
+
+    source_dir = os.path.dirname(os.path.abspath(args.html))
+    with open(args.html, encoding='utf-8') as f:
+        html = f.read()
+    css_path = os.path.join(source_dir, args.css)
+    with open(css_path, encoding='utf-8') as f:
+        css = f.read()
+
+    dynamic = collect_dynamic_classes(args.js_dir)
+    critical_css, deferred_css, stats = build(html, css, args.fold, dynamic)
+
+    os.makedirs(args.out, exist_ok=True)
+    with open(os.path.join(args.out, os.path.basename(args.html)), 'w', encoding='utf-8') as f:
+        f.write(inject(html, args.css, critical_css, args.css))
+    with open(os.path.join(args.out, args.css), 'w', encoding='utf-8') as f:
+        f.write(deferred_css)
+
+    # Copia os demais assets locais (js, imagens) para o diretório de saída
+    _, assets = parse_html(html)
+    for asset in dict.fromkeys(assets):
+        if asset == args.css:
+            continue
+        source = os.path.join(source_dir, asset)
+        target = os.path.join(args.out, asset)
+        if os.path.isfile(source):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copy2(source, target)
+
+    print(format_report(os.path.getsize(css_path), critical_css, deferred_css, stats))
+    print(f'\n📦 Build gerado em: {args.out}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+Testes do build de CSS crítico (python -m pytest tools)
+"""
+
+from critical_css import (
+    AtRule, Keyframes, MediaBlock, StatementAtRule, StyleRule,
+    add_virtual_children, build, compact, match_selector, parse_css,
+    parse_html, parse_selector, prune_keyframes, render,
+)
+
+
+HTML = """
+<html><body>
+    <nav class="navbar"><ul class="nav-menu"><li><a class="nav-link">Início</a></li></ul></nav>
+    <section class="hero">
+        <h1 class="hero-title"><span class="highlight" id="typing-text"></span></h1>
+        <p class="hero-description">Texto</p>
+        <div class="hero-buttons"><a class="btn">A</a><a class="btn btn-secondary">B</a></div>
+    </section>
+    <section class="about"><input type="email" name="email"></section>
+</body></html>
+"""
+
+
+def matches(selector, dynamic=frozenset()):
+    root, _ = parse_html(HTML)
+    add_virtual_children(root)
+    parts = parse_selector(selector)
+    return any(match_selector(parts, node, dynamic) for node in root.descendants())
+
+
+# ===== parse_css =====
+
+def test_parse_css_keeps_order_and_nesting():
+    items = parse_css("""
+        /* comentário { com chave } */
+        .a, .b > p { color: red; }
+        @media (min-width: 768px) { .a { color: blue; } }
+        @keyframes fade { from { opacity: 0; } to { opacity: 1; } }
+        @supports (display: grid) { .a :hover { display: grid; } }
+    """)
+
+    assert [type(item) for item in items] == [StyleRule, MediaBlock, Keyframes, AtRule]
+    assert items[0].selectors == ['.a', '.b > p']
+    assert items[1].prelude == '@media (min-width: 768px)'
+    assert items[1].rules[0].selectors == ['.a']
+    assert items[2].name == 'fade'
+    assert [rule.selectors for rule in items[2].rules] == [['from'], ['to']]
+
+
+def test_parse_css_ignores_braces_inside_strings():
+    items = parse_css(".a::before { content: '{'; } .b { color: red; }")
+    assert [item.selectors for item in items] == [['.a::before'], ['.b']]
+
+
+def test_parse_css_splits_statement_at_rules():
+    items = parse_css("""
+        @charset "utf-8";
+        @import url("fonts.css?a;b") screen;
+        .a { color: red; }
+    """)
+
+    assert items[:2] == [
+        StatementAtRule('@charset "utf-8"'),
+        StatementAtRule('@import url("fonts.css?a;b") screen'),
+    ]
+    assert items[2] == StyleRule(['.a'], ' color: red; ')
+
+
+def test_build_keeps_statement_at_rules_on_top():
+    css = '.hero-title { color: red; } @import url("extra.css");'
+    critical, deferred, _ = build(HTML, css)
+
+    assert critical.startswith('@import url("extra.css");.hero-title{')
+    assert deferred.startswith('@import url("extra.css");.hero-title{')
+
+
+def test_at_rule_body_is_not_compacted():
+    css = '@supports (display: grid) { .a :hover { display: grid; } }'
+    assert '.a :hover' in render(parse_css(css))
+
+
+def test_compact_keeps_strings():
+    assert compact(" content: ' : , ' ;  margin : 0 auto ; ") == "content:' : , ';margin:0 auto"
+
+
+# ===== match_selector =====
+
+def test_match_descendant_and_child_combinators():
+    assert matches('.hero .highlight')
+    assert matches('.hero-title > .highlight')
+    assert not matches('.hero > .highlight')
+    assert not matches('.about .highlight')
+
+
+def test_match_sibling_combinators():
+    assert matches('.hero-title + .hero-description')
+    assert matches('.hero-title ~ .hero-buttons')
+    assert not matches('.hero-buttons + .hero-title')
+
+
+def test_match_ids_attributes_and_pseudos():
+    assert matches('#typing-text')
+    assert matches('input[type="email"]')
+    assert not matches('input[type="text"]')
+    assert matches('.btn:hover::after')
+    assert matches(':root')
+    assert not matches('.missing:hover')
+
+
+def test_match_dynamic_classes():
+    assert not matches('.navbar.scrolled')
+    assert matches('.navbar.scrolled', dynamic={'scrolled'})
+    # Filho criado pelo JS dentro do #typing-text
+    assert not matches('.hero-title .highlight .cursor')
+    assert matches('.hero-title .highlight .cursor', dynamic={'cursor'})
+
+
+# ===== prune_keyframes =====
+
+def test_prune_keyframes_keeps_only_referenced():
+    items = parse_css("""
+        @keyframes used { to { opacity: 1; } }
+        @keyframes unused { to { opacity: 0; } }
+        @media (min-width: 768px) {
+            .a { animation: nested 1s; }
+            @keyframes unused { to { opacity: 0; } }
+        }
+        @keyframes nested { to { opacity: 1; } }
+        .b { animation-name: used; }
+    """)
+
+    pruned = prune_keyframes(items)
+    names = [item.name for item in pruned if isinstance(item, Keyframes)]
+    assert names == ['used', 'nested']
+    assert [type(rule) for rule in pruned[1].rules] == [StyleRule]
+
+
+# ===== build =====
+
+def test_build_splits_critical_and_prunes_unused():
+    css = """
+        .hero-title { font-size: 2rem; animation: fadeIn 1s; }
+        .about { padding: 0; }
+        .nunca-usado { color: red; }
+        @keyframes fadeIn { from { opacity: 0; } }
+        @keyframes sobra { from { opacity: 0; } }
+    """
+    critical, deferred, stats = build(HTML, css)
+
+    assert '.hero-title' in critical and '.about' not in critical
+    assert '@keyframes fadeIn' in critical
+    assert '.about' in deferred and '.hero-title' in deferred
+    assert '.nunca-usado' not in deferred and 'sobra' not in deferred
+    assert stats == {'total': 3, 'used': 2, 'critical': 1}